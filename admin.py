@@ -1,7 +1,8 @@
 import streamlit as st
 import pandas as pd
-import qrcode
+import segno
 import os
+import csv
 
 st.title("Admin Panel - Add / Update Print Jobs")
 
@@ -11,16 +12,28 @@ st.title("Admin Panel - Add / Update Print Jobs")
 CSV_PATH = "jobs.csv"
 QR_FOLDER = "qrcodes"
 
-os.makedirs(QR_FOLDER, exist_ok=True)
+@st.cache_resource
+def _bootstrap():
+    # one-shot filesystem setup, not repeated on every rerun
+    os.makedirs(QR_FOLDER, exist_ok=True)
+    if not os.path.exists(CSV_PATH):
+        pd.DataFrame(columns=["job_id", "client_name", "document_name", "status"]).to_csv(CSV_PATH, index=False)
+    return True
+
+_bootstrap()
 
 # ---------------------------
 # Load or create CSV
 # ---------------------------
-if os.path.exists(CSV_PATH):
-    df = pd.read_csv(CSV_PATH)
-else:
-    df = pd.DataFrame(columns=["job_id", "client_name", "document_name", "status"])
-    df.to_csv(CSV_PATH, index=False)
+@st.cache_data(max_entries=1, show_spinner=False)
+def read_jobs_csv(path, mtime):
+    # mtime is part of the cache key, so any write to the file invalidates it;
+    # max_entries=1 evicts the superseded snapshot instead of keeping one per save
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+df = read_jobs_csv(CSV_PATH, os.path.getmtime(CSV_PATH))
+# index by job_id so lookups/edits are hash-based rather than column scans
+df = df.set_index("job_id", drop=False)
 
 # ---------------------------
 # Deployment URL (IMPORTANT)
@@ -47,12 +60,12 @@ if st.button("Save Job"):
         st.stop()
 
     # Check if job already exists
-    if job_id in df["job_id"].astype(str).values:
-        df.loc[df["job_id"] == job_id, ["client_name", "document_name", "status"]] = [
-            client_name,
-            document_name,
-            status,
-        ]
+    if job_id in df.index:
+        df.at[job_id, "client_name"] = client_name
+        df.at[job_id, "document_name"] = document_name
+        df.at[job_id, "status"] = status
+        # Save CSV (edits still rewrite the file)
+        df.to_csv(CSV_PATH, index=False)
         st.success(f"Updated job {job_id}")
     else:
         new_row = {
@@ -61,20 +74,25 @@ if st.button("Save Job"):
             "document_name": document_name,
             "status": status,
         }
-        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+        if set(new_row) <= set(df.columns):
+            # Append one line in the CSV's own column order instead of rewriting the file
+            with open(CSV_PATH, "a", newline="") as f:
+                csv.writer(f).writerow([new_row.get(col, "") for col in df.columns])
+        else:
+            # header lacks a field (e.g. document_name): rewrite so the column is added, not dropped
+            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+            df.to_csv(CSV_PATH, index=False)
         st.success(f"Added new job {job_id}")
 
-    # Save CSV
-    df.to_csv(CSV_PATH, index=False)
-
     # ---------------------------
     # Generate QR Code
     # ---------------------------
     qr_link = VIEWER_URL + job_id
     qr_path = os.path.join(QR_FOLDER, f"{job_id}.png")
 
-    qr_img = qrcode.make(qr_link)
-    qr_img.save(qr_path)
+    # make_qr: never a Micro QR, which many phone scanners cannot read
+    qr_img = segno.make_qr(qr_link, error="m")
+    qr_img.save(qr_path, kind="png", scale=10, border=4)
 
     st.subheader("QR Code Generated")
     st.write("Scan this QR code to track the job:")
@@ -84,3 +102,4 @@ if st.button("Save Job"):
 st.divider()
 
 # Show table
+st.dataframe(read_jobs_csv(CSV_PATH, os.path.getmtime(CSV_PATH)))
@@ -2,15 +2,21 @@
 # - CODE DEC9/2025 
 
 import streamlit as st
-import qrcode
+import segno
 import os
+import io
+import re
 import requests
+from urllib3.util.retry import Retry
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from google.oauth2.service_account import Credentials
 import gspread
 import json
 import smtplib
+import threading
 from email.message import EmailMessage
 from PIL import Image, ImageDraw
 
@@ -21,16 +27,31 @@ st.set_page_config(page_title="Print Tracker", layout="wide")
 # ---------------------------
 LOGO_FILENAME = "logo.png"   # put your logo (optional) next to app.py
 QR_DIR = "qrcodes"
-os.makedirs(QR_DIR, exist_ok=True)
+SAVE_QR_FILES = False        # also keep a copy of every QR PNG in QR_DIR (debugging)
+TS_FMT = "%Y-%m-%d %H:%M:%S"  # created_at / view log timestamps
+
+@st.cache_resource
+def _bootstrap():
+    if SAVE_QR_FILES:
+        os.makedirs(QR_DIR, exist_ok=True)
+    return True
+
+_bootstrap()
 
 # ---------------------------
 # Helper: read secrets safely
 # ---------------------------
-def get_secret(key):
+def _read_secrets():
+    # st.secrets raises if no secrets.toml is configured at all
     try:
-        return st.secrets[key]
+        return dict(st.secrets)
     except Exception:
-        return None
+        return {}
+
+_SECRETS = _read_secrets()
+
+def get_secret(key):
+    return _SECRETS.get(key)
 
 ADMIN_PASSWORD = get_secret("ADMIN_PASSWORD")
 PUBLIC_URL = get_secret("PUBLIC_URL")
@@ -44,18 +65,11 @@ EMAIL_USER = get_secret("EMAIL_USER")
 EMAIL_PASS = get_secret("EMAIL_PASS")
 
 # service account pieces for gspread
-service_account_info = {
-    "type": get_secret("type"),
-    "project_id": get_secret("project_id"),
-    "private_key_id": get_secret("private_key_id"),
-    "private_key": get_secret("private_key"),
-    "client_email": get_secret("client_email"),
-    "client_id": get_secret("client_id"),
-    "auth_uri": get_secret("auth_uri"),
-    "token_uri": get_secret("token_uri"),
-    "auth_provider_x509_cert_url": get_secret("auth_provider_x509_cert_url"),
-    "client_x509_cert_url": get_secret("client_x509_cert_url"),
-}
+SERVICE_ACCOUNT_KEYS = (
+    "type", "project_id", "private_key_id", "private_key", "client_email", "client_id",
+    "auth_uri", "token_uri", "auth_provider_x509_cert_url", "client_x509_cert_url",
+)
+service_account_info = {k: _SECRETS.get(k) for k in SERVICE_ACCOUNT_KEYS}
 
 # Quick secrets check
 missing = [k for k, v in {
@@ -75,116 +89,152 @@ if missing:
 # Google Sheets auth
 # ---------------------------
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
-try:
-    credentials = Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
-    gc = gspread.authorize(credentials)
+JOBS_HEADER = ["job_id", "client_name", "file_name", "client_email", "status", "created_at", "qr_path"]
+
+@st.cache_resource(show_spinner=False)
+def get_credentials():
+    """Parses the service-account private key once per process."""
+    return Credentials.from_service_account_info(service_account_info, scopes=SCOPES)
+
+@st.cache_resource(show_spinner=False)
+def get_ws():
+    """Authorizes once per process and returns the 'Jobs' worksheet (header ensured)."""
+    gc = gspread.authorize(get_credentials())
     sh = gc.open_by_key(SHEET_ID)
-except Exception as e:
-    st.error("Failed to authenticate with Google Sheets.")
-    st.exception(e)
-    st.stop()
 
-# Ensure Jobs sheet exists and header
-try:
+    # Ensure Jobs sheet exists and header
     try:
         ws = sh.worksheet("Jobs")
     except Exception:
         ws = sh.add_worksheet(title="Jobs", rows="2000", cols="12")
 
-    expected_header = ["job_id", "client_name", "file_name", "client_email", "status", "created_at", "qr_path"]
     current_header = ws.row_values(1)
-    if not current_header or current_header[:7] != expected_header:
+    if not current_header or current_header[:7] != JOBS_HEADER:
         ws.clear()
-        ws.append_row(expected_header)
+        ws.append_row(JOBS_HEADER)
+    return ws
+
+try:
+    ws = get_ws()
+    sh = ws.spreadsheet
 except Exception as e:
-    st.error("Failed to prepare worksheet 'Jobs'.")
+    st.error("Failed to connect to Google Sheets worksheet 'Jobs'.")
     st.exception(e)
     st.stop()
 
 # ---------------------------
 # Utilities
 # ---------------------------
-def upload_to_imgbb(image_path):
-    """Uploads local image to ImgBB; returns direct image URL"""
+@st.cache_resource
+def _imgbb_session():
+    """One keep-alive HTTP session per process so uploads reuse the TLS connection."""
+    s = requests.Session()
+    s.headers.update({"User-Agent": "mcadd1/1.0"})
+    # retry connect errors and rate-limit/5xx replies with backoff; read=0 so a slow upload
+    # that may already have succeeded is never re-sent (nor waits out 4x the timeout).
+    # Retry-After is ignored: a long one would stall the Create Job click for minutes/hours
+    retry = Retry(total=3, read=0, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=frozenset({"POST"}), respect_retry_after_header=False,
+                  raise_on_status=False)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry)
+    s.mount("https://", adapter)
+    return s
+
+def upload_to_imgbb(image_bytes, filename="qr.png"):
+    """Uploads in-memory PNG bytes to ImgBB; returns direct image URL"""
     if not IMGBB_API_KEY:
         raise RuntimeError("IMGBB_API_KEY missing from secrets.")
     url = "https://api.imgbb.com/1/upload"
-    with open(image_path, "rb") as f:
-        files = {"image": f}
-        data = {"key": IMGBB_API_KEY}
-        resp = requests.post(url, data=data, files=files, timeout=30)
+    files = {"image": (filename, image_bytes, "image/png")}
+    data = {"key": IMGBB_API_KEY}
+    resp = _imgbb_session().post(url, data=data, files=files, timeout=30)
     resp.raise_for_status()
     j = resp.json()
     if not j.get("success"):
         raise RuntimeError("ImgBB upload failed: " + json.dumps(j))
     return j["data"]["url"]
 
+@st.cache_resource(max_entries=512, show_spinner=False)
+def _qr_matrix(link, error):
+    """Padded boolean module matrix for link; shared across reruns, so read-only."""
+    qr = segno.make_qr(link, error=error)
+    # segno rows are bytearrays of 0/1, so the matrix converts without a Python loop;
+    # pad the 4-module quiet zone the drawing code expects
+    matrix = np.frombuffer(b"".join(qr.matrix), dtype=np.uint8).reshape(len(qr.matrix), -1).astype(bool)
+    matrix = np.pad(matrix, 4)
+    matrix.flags.writeable = False
+    return matrix
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def _logo_composite(max_logo, mtime):
+    """Logo thumbnail on its rounded white plate; one per QR size (mtime picks up a replaced logo)."""
+    logo = Image.open(LOGO_FILENAME).convert("RGBA")
+    logo.thumbnail((max_logo, max_logo), Image.LANCZOS)
+
+    logo_bg_size = (logo.size[0] + 10, logo.size[1] + 10)
+    logo_bg = Image.new("RGBA", logo_bg_size, (255, 255, 255, 255))
+    mask = Image.new("L", logo_bg_size, 0)
+    mask_draw = ImageDraw.Draw(mask)
+    mask_draw.rounded_rectangle([0, 0, logo_bg_size[0], logo_bg_size[1]], radius=int(min(logo_bg_size) / 4), fill=255)
+    logo_bg.putalpha(mask)
+
+    lx = (logo_bg_size[0] - logo.size[0]) // 2
+    ly = (logo_bg_size[1] - logo.size[1]) // 2
+    logo_bg.paste(logo, (lx, ly), logo)
+    return logo_bg
+
 # QR generator (rounded modules, colored, center logo)
-def generate_colored_qr_image(link, save_path,
+def generate_colored_qr_image(link, save_path=None,
                               module_px=12,
                               outer_border_px=18,
                               dot_color=(0, 59, 142),
                               bg_color=(255, 235, 59)):
-    qr = qrcode.QRCode(
-        version=None,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        box_size=1,
-        border=4
-    )
-    qr.add_data(link)
-    qr.make(fit=True)
-    matrix = qr.get_matrix()
-    size = len(matrix)
+    # H is only needed so the code survives the centre logo; without one, M
+    # gives a smaller matrix (fewer modules to draw, smaller PNG to upload)
+    has_logo = os.path.exists(LOGO_FILENAME)
+    matrix = _qr_matrix(link, "h" if has_logo else "m")
+    size = matrix.shape[0]
 
     inner_px = size * module_px
     canvas_px = inner_px + 2 * outer_border_px
 
     canvas = Image.new("RGB", (canvas_px, canvas_px), dot_color)
-    qr_bg = Image.new("RGB", (inner_px, inner_px), bg_color)
-    draw = ImageDraw.Draw(qr_bg)
-
-    def module_bbox(x, y):
-        return (x * module_px, y * module_px, (x + 1) * module_px, (y + 1) * module_px)
 
-    # Finder pattern drawing (classic)
+    # Rounded modules for other modules: rasterize one rounded stamp and tile it
+    # over the module mask (broadcast + reshape) instead of one rounded_rectangle per module
     finder_positions = [(0, 0), (size - 7, 0), (0, size - 7)]
+    dots = matrix.copy()
     for fx, fy in finder_positions:
-        draw.rectangle((fx * module_px, fy * module_px, (fx + 7) * module_px, (fy + 7) * module_px), fill=dot_color)
-        draw.rectangle(((fx + 1) * module_px, (fy + 1) * module_px, (fx + 6) * module_px, (fy + 6) * module_px), fill=bg_color)
-        draw.rectangle(((fx + 2) * module_px, (fy + 2) * module_px, (fx + 5) * module_px, (fy + 5) * module_px), fill=dot_color)
+        dots[fy:fy + 7, fx:fx + 7] = False
 
-    # Rounded modules for other modules
     radius = int(module_px * 0.35)
-    for y in range(size):
-        for x in range(size):
-            in_finder = any((fx <= x < fx + 7 and fy <= y < fy + 7) for fx, fy in finder_positions)
-            if in_finder:
-                continue
-            if matrix[y][x]:
-                bbox = module_bbox(x, y)
-                draw.rounded_rectangle(bbox, radius=radius, fill=dot_color)
+    stamp = Image.new("L", (module_px, module_px), 0)
+    ImageDraw.Draw(stamp).rounded_rectangle((0, 0, module_px - 1, module_px - 1), radius=radius, fill=255)
+    stamp_mask = np.asarray(stamp) > 0
+    dot_mask = (dots[:, None, :, None] & stamp_mask[None, :, None, :]).reshape(inner_px, inner_px)
+
+    pixels = np.empty((inner_px, inner_px, 3), dtype=np.uint8)
+    pixels[:] = bg_color
+    pixels[dot_mask] = dot_color
+
+    # Finder pattern drawing (classic) as slice fills; the +1 keeps the
+    # inclusive right/bottom edge the old draw.rectangle calls painted
+    for fx, fy in finder_positions:
+        for inset, color in ((0, dot_color), (1, bg_color), (2, dot_color)):
+            y0, y1 = (fy + inset) * module_px, (fy + 7 - inset) * module_px + 1
+            x0, x1 = (fx + inset) * module_px, (fx + 7 - inset) * module_px + 1
+            pixels[y0:y1, x0:x1] = color
+    qr_bg = Image.fromarray(pixels, "RGB")
 
     # Paste QR area onto blue canvas (outer border)
     canvas.paste(qr_bg, (outer_border_px, outer_border_px))
 
     # Center logo if provided
-    if os.path.exists(LOGO_FILENAME):
+    if has_logo:
         try:
-            logo = Image.open(LOGO_FILENAME).convert("RGBA")
-            max_logo_w = int(inner_px * 0.20)
-            max_logo_h = int(inner_px * 0.20)
-            logo.thumbnail((max_logo_w, max_logo_h), Image.LANCZOS)
-
-            logo_bg_size = (logo.size[0] + 10, logo.size[1] + 10)
-            logo_bg = Image.new("RGBA", logo_bg_size, (255, 255, 255, 255))
-            mask = Image.new("L", logo_bg_size, 0)
-            mask_draw = ImageDraw.Draw(mask)
-            mask_draw.rounded_rectangle([0, 0, logo_bg_size[0], logo_bg_size[1]], radius=int(min(logo_bg_size) / 4), fill=255)
-            logo_bg.putalpha(mask)
-
-            lx = (logo_bg_size[0] - logo.size[0]) // 2
-            ly = (logo_bg_size[1] - logo.size[1]) // 2
-            logo_bg.paste(logo, (lx, ly), logo)
+            max_logo = int(inner_px * 0.20)
+            logo_bg = _logo_composite(max_logo, os.path.getmtime(LOGO_FILENAME))
+            logo_bg_size = logo_bg.size
 
             cx = canvas_px // 2
             cy = canvas_px // 2
@@ -194,7 +244,15 @@ def generate_colored_qr_image(link, save_path,
         except Exception:
             pass
 
-    canvas.save(save_path, format="PNG", optimize=True)
+    # encode once in memory; the file copy is only written when a path is given.
+    # optimize=True costs ~4x the encode time for a ~5% smaller file here
+    buf = io.BytesIO()
+    canvas.save(buf, format="PNG")
+    png_bytes = buf.getvalue()
+    if save_path:
+        with open(save_path, "wb") as f:
+            f.write(png_bytes)
+    return png_bytes
     
 def log_page_view(email):
     try:
@@ -212,7 +270,7 @@ def log_page_view(email):
 
     ws_views.append_row([
         email,
-        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        datetime.now().strftime(TS_FMT),
         ip,
         user_agent
     ])
@@ -220,63 +278,101 @@ def log_page_view(email):
 # ---------------------------
 # Core functions that implement one-QR-per-email logic
 # ---------------------------
+_IMAGE_URL_RE = re.compile(r'=IMAGE\("([^"]+)"')
+
 def find_existing_qr_for_email(email):
-    """Search sheet for any row with matching client_email and a non-empty qr_path that includes a URL.
+    """Search the (cached) jobs for any row with matching client_email and a qr_url.
        Returns the public_url string or None."""
     try:
-        records = ws.get_all_records()
-        for r in records:
-            cell_email = str(r.get("client_email") or "").strip().lower()
-            if cell_email == str(email).strip().lower():
-                qr_cell = r.get("qr_path", "") or ""
-                # if cell contains =IMAGE("...") extract URL
-                if isinstance(qr_cell, str):
-                    if qr_cell.startswith('=IMAGE("') and '"' in qr_cell[8:]:
-                        # safe extraction
-                        try:
-                            url = qr_cell.split('"')[1]
-                            if url.startswith("http"):
-                                return url
-                        except Exception:
-                            pass
-                    # if cell already contains URL directly
-                    if qr_cell.startswith("http"):
-                        return qr_cell
-        return None
+        df, email_index = load_jobs()[:2]
+        rows = email_index.get(str(email).strip().lower())
+        if rows is None:
+            return None
+        urls = df["qr_url"].iloc[rows]
+        urls = urls[urls.str.startswith("http")]
+        return urls.iloc[0] if not urls.empty else None
     except Exception:
         return None
 
-def generate_qr_and_upload_for_email(email):
-    """Creates QR that links to PUBLIC_URL?email=<email>, uploads once, returns public_url and local_path."""
-    link = f"{PUBLIC_URL}?email={requests.utils.requote_uri(email)}"
+def email_qr_link(email, base_url):
+    return f"{base_url}?email={requests.utils.requote_uri(email)}"
+
+@st.cache_data(show_spinner="Uploading QR…", persist="disk")
+def generate_qr_and_upload_for_email(email, base_url):
+    """Creates QR that links to base_url?email=<email>, uploads once, returns png_bytes and public_url.
+       base_url (PUBLIC_URL) is part of the cache key, so a redeploy doesn't reuse stale QRs."""
     safe_name = email.replace("@", "_at_").replace(".", "_")
-    local_path = os.path.join(QR_DIR, f"{safe_name}.png")
-    generate_colored_qr_image(link, local_path)
-    public_url = upload_to_imgbb(local_path)
-    return local_path, public_url
+    local_path = os.path.join(QR_DIR, f"{safe_name}.png") if SAVE_QR_FILES else None
+    png_bytes = generate_colored_qr_image(email_qr_link(email, base_url), local_path)
+    public_url = upload_to_imgbb(png_bytes, filename=f"{safe_name}.png")
+    return png_bytes, public_url
 
-def generate_qr_and_upload(job_id):
+@st.cache_data(show_spinner="Uploading QR…", persist="disk")
+def generate_qr_and_upload(job_id, base_url):
     # kept for backward compatibility but not used directly in create flow
-    link = f"{PUBLIC_URL}?job_id={job_id}"
-    local_path = os.path.join(QR_DIR, f"{job_id}.png")
-    generate_colored_qr_image(link, local_path)
-    public_url = upload_to_imgbb(local_path)
-    return local_path, public_url
+    link = f"{base_url}?job_id={job_id}"
+    local_path = os.path.join(QR_DIR, f"{job_id}.png") if SAVE_QR_FILES else None
+    png_bytes = generate_colored_qr_image(link, local_path)
+    public_url = upload_to_imgbb(png_bytes, filename=f"{job_id}.png")
+    return png_bytes, public_url
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_jobs():
+    """(jobs DataFrame, {lowercased client_email: row positions}, {job_id: sheet row}) fetched
+       and indexed together. The qr_path IMAGE formulas are replaced by a parsed qr_url column."""
+    # list-of-lists straight into pandas; skips get_all_records' per-row dicts.
+    # FORMULA rendering keeps =IMAGE(...) intact (formatted values render it as "");
+    # every other cell is stored as text, so it reads back unchanged. One read keeps
+    # column G aligned with its row even if rows are deleted concurrently.
+    rows = ws.get_all_values(value_render_option="FORMULA")
+    if not rows:
+        return pd.DataFrame(columns=JOBS_HEADER[:-1] + ["qr_url"]), {}, {}
+    df = pd.DataFrame(rows[1:], columns=rows[0])
+
+    qr_cells = df["qr_path"].astype(str)
+    df["qr_url"] = qr_cells.str.extract(_IMAGE_URL_RE, expand=False).fillna(qr_cells)
+    df = df.drop(columns=["qr_path"])
+
+    # email lookups become a dict hit instead of a lower() pass over the column
+    email_index = df.groupby(df["client_email"].astype(str).str.strip().str.lower()).indices if not df.empty else {}
+    # sheet row = position + 2 (header row, 1-based); same snapshot as df, so never older than it
+    row_index = {jid: i for i, jid in enumerate(df["job_id"].astype(str), start=2)}
+    return df, email_index, row_index
 
 def load_jobs_df():
-    records = ws.get_all_records()
-    return pd.DataFrame(records)
+    return load_jobs()[0]
+
+def clear_jobs_cache():
+    load_jobs.clear()
 
 def append_job_row(values):
-    ws.append_row(values)
+    """Appends one job row and returns its sheet row number.
+       Only the qr_path cell is evaluated (its IMAGE formula); everything else is stored as plain text."""
+    # a leading apostrophe stops USER_ENTERED from turning dates/numbers/"=..." input into non-text;
+    # chosen by position, so a client/file name that looks like =IMAGE(...) is still quoted
+    qr_col = JOBS_HEADER.index("qr_path")
+    cells = [v if i == qr_col else "'" + str(v) for i, v in enumerate(values)]
+    resp = ws.append_row(cells, value_input_option="USER_ENTERED")
+    clear_jobs_cache()
+    # updatedRange looks like "Jobs!A12:G12"
+    updated_range = resp["updates"]["updatedRange"]
+    return gspread.utils.a1_to_rowcol(updated_range.split("!")[-1].split(":")[0])[0]
+
+def job_row_index():
+    """{job_id: sheet row} from the cached jobs snapshot (cleared on every write, <=30s old)."""
+    return load_jobs()[2]
 
 def update_status_in_sheet(job_id, new_status):
-    records = ws.get_all_records()
-    for i, r in enumerate(records, start=2):
-        if str(r.get("job_id")) == str(job_id):
-            ws.update_cell(i, 5, new_status)  # status is column 5
-            return True
-    return False
+    row = job_row_index().get(str(job_id))
+    if row is None:
+        # job created elsewhere since the snapshot was taken
+        clear_jobs_cache()
+        row = job_row_index().get(str(job_id))
+        if row is None:
+            return False
+    ws.update_cell(row, 5, new_status)  # status is column 5
+    clear_jobs_cache()
+    return True
 
 def resize_row_height(ws_obj, row_number, height=220):
     body = {
@@ -300,7 +396,38 @@ def resize_row_height(ws_obj, row_number, height=220):
 # ---------------------------
 # Email sending (optional)
 # ---------------------------
-def send_qr_email_smtp(to_email, client_name, job_id, qr_url, local_qr_path):
+@st.cache_resource(show_spinner=False)
+def _smtp_connection():
+    """Per-process slot for one logged-in SMTP connection (skips TCP+STARTTLS+AUTH per email).
+       Resolve it on the script thread; _smtp_send only touches the slot, never st.*."""
+    return {"server": None, "lock": threading.Lock()}
+
+def _smtp_login():
+    server = smtplib.SMTP(EMAIL_HOST, int(EMAIL_PORT), timeout=30)
+    server.starttls()
+    server.login(EMAIL_USER, EMAIL_PASS)
+    return server
+
+def _smtp_send(msg, conn):
+    with conn["lock"]:
+        server = conn["server"]
+        if server is not None:
+            try:
+                server.send_message(msg)
+                return
+            except smtplib.SMTPServerDisconnected:
+                pass
+            except smtplib.SMTPResponseException as e:
+                # idle sessions are usually ended with a 421 reply (smtplib closes the socket)
+                if e.smtp_code != 421:
+                    raise
+        # no session yet, or the server dropped the idle one: reconnect once and resend
+        conn["server"] = None
+        server = _smtp_login()
+        conn["server"] = server
+        server.send_message(msg)
+
+def send_qr_email_smtp(to_email, client_name, job_id, qr_url, qr_png, smtp_conn):
     if not (EMAIL_HOST and EMAIL_PORT and EMAIL_USER and EMAIL_PASS):
         return False, "Missing SMTP secrets."
     try:
@@ -322,15 +449,9 @@ Thanks,
 Microcadd
 """
         msg.set_content(body)
-        with open(local_qr_path, "rb") as f:
-            img_data = f.read()
-        msg.add_attachment(img_data, maintype="image", subtype="png", filename=f"{job_id}.png")
+        msg.add_attachment(qr_png, maintype="image", subtype="png", filename=f"{job_id}.png")
 
-        server = smtplib.SMTP(EMAIL_HOST, int(EMAIL_PORT))
-        server.starttls()
-        server.login(EMAIL_USER, EMAIL_PASS)
-        server.send_message(msg)
-        server.quit()
+        _smtp_send(msg, smtp_conn)
         return True, None
     except Exception as e:
         return False, str(e)
@@ -344,37 +465,45 @@ def viewer_page():
     # SAFARI-SAFE query param handling
     param_email = st.query_params.get("email", "")
 
-    email_input = st.text_input(
-        "Enter your email to view all your job orders:",
-        value=param_email
-    )
+    # a form only reruns the page on submit, not on every edit of the field
+    with st.form("viewer_lookup"):
+        email_input = st.text_input(
+            "Enter your email to view all your job orders:",
+            value=param_email
+        )
+        st.form_submit_button("View my jobs")
 
     if not email_input:
         st.info("Enter the same email you used when submitting your print job or scan the client QR.")
         return
 
-    df = load_jobs_df()
+    df, email_index = load_jobs()[:2]
     if df.empty:
         st.warning("No jobs found.")
         return
 
-    # filter by email (case-insensitive)
-    user_jobs = df[df["client_email"].astype(str).str.lower() == email_input.strip().lower()]
+    # filter by email (case-insensitive) via the cached email -> rows index
+    rows = email_index.get(email_input.strip().lower())
 
-    if user_jobs.empty:
+    if rows is None:
         st.error("No job orders found for this email.")
         return
 
-        st.success(f"Found {len(user_jobs)} job order(s) for: **{email_input}**")
-    log_page_view(email_input)
+    user_jobs = df.iloc[rows]
+    st.success(f"Found {len(user_jobs)} job order(s) for: **{email_input}**")
+    # log once per looked-up email, not on every rerun (e.g. job selectbox changes)
+    if st.session_state.get("logged_view_email") != email_input:
+        log_page_view(email_input)
+        st.session_state.logged_view_email = email_input
 
     # show as table
     st.subheader("📋 Your Job Orders")
     st.dataframe(user_jobs.reset_index(drop=True))
 
     # allow selecting a job to show status & QR
-    job_id = st.selectbox("Select a job to view its status:", user_jobs["job_id"].tolist())
-    selected = user_jobs[user_jobs["job_id"] == job_id].iloc[0]
+    jobs_by_id = {str(r["job_id"]): r for r in user_jobs.to_dict("records")}
+    job_id = st.selectbox("Select a job to view its status:", list(jobs_by_id))
+    selected = jobs_by_id[job_id]
 
     st.markdown(f"### 🧾 Job ID: {selected['job_id']}")
     st.markdown(f"**Client:** {selected.get('client_name','')}")
@@ -385,27 +514,28 @@ def viewer_page():
     current_status = selected.get("status", "Pending")
     try:
         current_index = STATUS_STEPS.index(current_status)
-    except Exception:
+    except ValueError:
         current_index = 0
 
-    cols = st.columns(len(STATUS_STEPS))
+    # all pills go out in a single markdown element instead of one per column
+    pills = []
     for i, step in enumerate(STATUS_STEPS):
-        with cols[i]:
-            if i < current_index:
-                color = "#0A3B99"
-            elif i == current_index:
-                color = "#FFD800"
-            else:
-                color = "#D3D3D3"
-            st.markdown(
-                f"""
-                <div style="text-align:center;">
-                    <div style="width:40px;height:40px;border-radius:50%;background:{color};border:2px solid #052a66;margin:auto;"></div>
-                    <div style="font-size:12px;margin-top:6px">{step}</div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+        if i < current_index:
+            color = "#0A3B99"
+        elif i == current_index:
+            color = "#FFD800"
+        else:
+            color = "#D3D3D3"
+        pills.append(
+            f'<div style="flex:1;text-align:center;">'
+            f'<div style="width:40px;height:40px;border-radius:50%;background:{color};border:2px solid #052a66;margin:auto;"></div>'
+            f'<div style="font-size:12px;margin-top:6px">{step}</div>'
+            f'</div>'
+        )
+    st.markdown(
+        '<div style="display:flex;justify-content:space-between;">' + "".join(pills) + "</div>",
+        unsafe_allow_html=True
+    )
 
 def admin_page():
     st.title("🛠 Admin Panel — Restricted Access")
@@ -417,9 +547,11 @@ def admin_page():
         st.session_state.logged_in = False
 
     if not st.session_state.logged_in:
-        password = st.text_input("Enter admin password:", type="password")
+        with st.form("admin_login"):
+            password = st.text_input("Enter admin password:", type="password")
+            login = st.form_submit_button("Login")
 
-        if st.button("Login"):
+        if login:
             if password == ADMIN_PASSWORD:
                 st.session_state.logged_in = True
                 st.success("Login successful!")
@@ -445,42 +577,56 @@ def admin_page():
             else:
                 # create new job row
                 job_no = len(df) + 1
-                job_id = f"MCADD_{str(job_no).zfill(3)}"
-                created_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                job_id = f"MCADD_{job_no:03d}"
+                created_at = datetime.now().strftime(TS_FMT)
                 try:
                     # check for existing uploaded QR for this email
                     existing_url = find_existing_qr_for_email(client_email)
+                    qr_png = None
                     if existing_url:
                         public_url = existing_url
                         # reuse - we still write IMAGE(...) into new job row
                     else:
                         # generate one QR per email and upload it
-                        local_path, public_url = generate_qr_and_upload_for_email(client_email)
+                        qr_png, public_url = generate_qr_and_upload_for_email(client_email, PUBLIC_URL)
 
                     qr_formula = f'=IMAGE("{public_url}")'
 
-                    # append job row: job_id, client_name, file_name, client_email, status, created_at, qr_path
-                    ws.append_row([job_id, client, file_name, client_email, "Pending", created_at, ""])
-                    last_row = len(ws.get_all_values())
-
-                    # update QR column for new row with IMAGE formula
-                    ws.update(f"G{last_row}:G{last_row}", [[qr_formula]], value_input_option="USER_ENTERED")
-
-                    # make the row tall so image shows bigger
-                    resize_row_height(ws, last_row, height=220)
-
-                    # show generated/used QR in admin UI
-                    st.image(public_url, caption="Client QR (re-used if exists)", width=300)
+                    # append job row (IMAGE formula included): job_id, client_name, file_name, client_email, status, created_at, qr_path
+                    last_row = append_job_row([job_id, client, file_name, client_email, "Pending", created_at, qr_formula])
 
                     # optionally email QR to client
-                    if client_email and EMAIL_HOST and EMAIL_PORT and EMAIL_USER and EMAIL_PASS:
-                        ok, err = send_qr_email_smtp(client_email, client, job_id, public_url, os.path.join(QR_DIR, client_email.replace("@", "_at_").replace(".", "_") + ".png"))
-                        if ok:
-                            st.success(f"Job {job_id} created and emailed to {client_email}")
+                    send_email = bool(client_email and EMAIL_HOST and EMAIL_PORT and EMAIL_USER and EMAIL_PASS)
+                    if send_email and qr_png is None:
+                        # re-used QR: render the attachment locally, no upload needed
+                        qr_png = generate_colored_qr_image(email_qr_link(client_email, PUBLIC_URL))
+
+                    # row resize and email are independent once the row exists: overlap them
+                    with ThreadPoolExecutor(max_workers=2) as pool:
+                        # make the row tall so image shows bigger
+                        resize_future = pool.submit(resize_row_height, ws, last_row, 220)
+                        email_future = pool.submit(send_qr_email_smtp, client_email, client, job_id, public_url, qr_png,
+                                                   _smtp_connection()) if send_email else None
+
+                        # show generated/used QR in admin UI
+                        st.image(public_url, caption="Client QR (re-used if exists)", width=300)
+
+                        # the row already exists here: a failed resize is cosmetic, not a failed create
+                        try:
+                            resize_future.result()
+                        except Exception as e:
+                            st.warning(f"Job {job_id} created but row resize failed: {e}")
+                        if email_future is not None:
+                            try:
+                                ok, err = email_future.result()
+                            except Exception as e:
+                                ok, err = False, str(e)
+                            if ok:
+                                st.success(f"Job {job_id} created and emailed to {client_email}")
+                            else:
+                                st.warning(f"Job {job_id} created but email failed: {err}")
                         else:
-                            st.warning(f"Job {job_id} created but email failed: {err}")
-                    else:
-                        st.success(f"Job {job_id} created.")
+                            st.success(f"Job {job_id} created.")
 
                 except Exception as e:
                     st.error("Error creating job: " + str(e))
@@ -502,8 +648,14 @@ def admin_page():
                     st.error("Failed to update status.")
 
     # jobs table visible to both roles
+    # only one page of rows is serialized to the browser per rerun
     st.subheader("📋 All Jobs (live from sheet)")
-    st.dataframe(load_jobs_df())
+    all_jobs = load_jobs_df()
+    page_size = 100
+    n_pages = max(1, (len(all_jobs) + page_size - 1) // page_size)
+    page_no = st.number_input("Page", min_value=1, max_value=n_pages, value=n_pages, step=1)
+    start = (page_no - 1) * page_size
+    st.dataframe(all_jobs.iloc[start:start + page_size], use_container_width=True, hide_index=True)
 
 # ---------------------------
 # Navigation
@@ -1,34 +1,41 @@
 import streamlit as st
 import pandas as pd
+import os
 
 st.title("Print Job Status Viewer")
 
+@st.cache_resource(max_entries=1, show_spinner=False)
+def jobs_by_id(mtime):
+    # job_id -> row dict for O(1) lookups; mtime is part of the cache key,
+    # so a job saved in admin.py is visible on the very next scan.
+    # cache_resource hands back the shared dict (no unpickle per view); read-only here
+    df = pd.read_csv("jobs.csv", dtype=str, keep_default_na=False)
+    return {str(r["job_id"]): r for r in df.to_dict("records")}
+
+# Try to read job_id from URL (before touching the CSV, so empty visits cost nothing)
+job_id = st.query_params.get("job_id")
+
+if not job_id:
+    st.info("Please scan a QR code to view your job status.")
+    st.write("No job ID detected in the URL.")
+    st.stop()
+
+job_id = str(job_id)
+
 # Load CSV safely
 try:
-    df = pd.read_csv("jobs.csv")
+    jobs = jobs_by_id(os.path.getmtime("jobs.csv"))
 except:
     st.error("jobs.csv not found.")
     st.stop()
 
-# Try to read job_id from URL
-query_params = st.query_params
-job_id = query_params.get("job_id", None)
-
-if job_id:
-    job_id = str(job_id)
-    
-    # Find the job in CSV
-    job = df[df["job_id"] == job_id]
-
-    if len(job) == 0:
-        st.error("Job ID not found.")
-    else:
-        job = job.iloc[0]
-
-        st.subheader(f"Job ID: {job['job_id']}")
-        st.write(f"*Client Name:* {job['client_name']}")
-        st.write(f"*Document:* {job['document_name']}")
-        st.write(f"*Status:* {job['status']}")
+# Find the job in CSV
+job = jobs.get(job_id)
+
+if job is None:
+    st.error("Job ID not found.")
 else:
-    st.info("Please scan a QR code to view your job status.")
-    st.write("No job ID detected in the URL.")
+    st.subheader(f"Job ID: {job['job_id']}")
+    st.write(f"*Client Name:* {job['client_name']}")
+    st.write(f"*Document:* {job['document_name']}")
+    st.write(f"*Status:* {job['status']}")